@@ -0,0 +1,19 @@
+# asgi.py - ASGI entry point for serving the Story Recommender Demo with uvicorn
+from fastapi import FastAPI
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app, recommender
+
+app = FastAPI()
+
+@app.get("/health")
+async def health():
+    """Answered on the event loop without entering the Flask app"""
+    return {"status": "ok", "stories": len(recommender.stories)}
+
+# Every other route is served by the Flask app
+app.mount("/", WSGIMiddleware(flask_app))
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=5000)
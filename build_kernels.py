@@ -0,0 +1,22 @@
+# build_kernels.py - Compile rec2's numeric kernels ahead of time with numba
+#
+# Produces the rec2_kernels extension module next to rec2.py; rec2 imports it
+# when present and otherwise JIT-compiles the same functions on first use.
+#
+# Usage: pip install numba setuptools && python build_kernels.py
+
+from numba.pycc import CC
+import os
+
+import rec2
+
+cc = CC('rec2_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('decayed_story_totals', 'f8[:](i4[:], f8[:], f8[:], f8, f8, i8)')(
+    rec2._decayed_story_totals_impl
+)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,45 @@
+# build_stories.py - Pack the story bodies into stories.dat for app.py
+#
+# Layout: <I story count>, then per story <H id length><id bytes><I start><I end>
+# (absolute offsets), followed by the concatenated UTF-8 HTML bodies.
+#
+# Usage: python build_stories.py
+
+from markupsafe import Markup, escape
+import textwrap
+import struct
+import os
+
+STORIES_DAT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stories.dat')
+
+
+def render_story_html(text):
+    """Dedent a story body and turn its blank-line separated paragraphs into safe HTML"""
+    paragraphs = textwrap.dedent(text).strip().split("\n\n")
+    return Markup("".join(f"<p>{escape(p.strip())}</p>" for p in paragraphs))
+
+
+def build(path=STORIES_DAT):
+    """Render every story body and write the offset table plus bodies to path"""
+    from story_content import STORY_CONTENT
+
+    ids = [sid.encode('utf-8') for sid in STORY_CONTENT]
+    bodies = [render_story_html(text).encode('utf-8') for text in STORY_CONTENT.values()]
+
+    header_size = 4 + sum(2 + len(sid) + 8 for sid in ids)
+    header = [struct.pack('<I', len(ids))]
+    offset = header_size
+    for sid, body in zip(ids, bodies):
+        header.append(struct.pack('<H', len(sid)) + sid + struct.pack('<II', offset, offset + len(body)))
+        offset += len(body)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(header))
+        f.write(b''.join(bodies))
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == '__main__':
+    print(f"Wrote {build()}")
@@ -12,8 +12,9 @@ public class PythonServerClient : IDisposable
     private readonly GrpcChannel _channel;
     private readonly EventService.EventServiceClient _client;
     private AsyncDuplexStreamingCall<ClientMessage, ServerMessage> _stream;
-    private readonly ConcurrentDictionary<string, TaskCompletionSource<RecommendationsResponse>> _pendingRequests;
+    private readonly ConcurrentDictionary<uint, TaskCompletionSource<RecommendationsResponse>> _pendingRequests;
     private readonly CancellationTokenSource _cancellationTokenSource;
+    private int _nextRequestId;
     
     public event EventHandler<SaveStateRequest> OnSaveStateRequested;
     
@@ -21,7 +22,7 @@ public class PythonServerClient : IDisposable
     {
         _channel = GrpcChannel.ForAddress(address);
         _client = new EventService.EventServiceClient(_channel);
-        _pendingRequests = new ConcurrentDictionary<string, TaskCompletionSource<RecommendationsResponse>>();
+        _pendingRequests = new ConcurrentDictionary<uint, TaskCompletionSource<RecommendationsResponse>>();
         _cancellationTokenSource = new CancellationTokenSource();
     }
     
@@ -94,7 +95,7 @@ public class PythonServerClient : IDisposable
     
     public async Task<RecommendationsResponse> GetRecommendationsAsync(string userId)
     {
-        var requestId = Guid.NewGuid().ToString();
+        var requestId = unchecked((uint)Interlocked.Increment(ref _nextRequestId));
         var tcs = new TaskCompletionSource<RecommendationsResponse>();
         _pendingRequests[requestId] = tcs;
         
@@ -4,7 +4,21 @@ import asyncio
 import contract_pb2
 import contract_pb2_grpc
 from typing import Dict
-import uuid
+import itertools
+
+# Analytic events are queued and written as one batch message per burst
+EVENT_BATCH_SIZE = 64
+EVENT_FLUSH_INTERVAL = 0.05  # seconds to wait for more events before writing
+
+# gRPC already sets TCP_NODELAY on its sockets; these keep the long-lived
+# stream alive across idle periods and let batches go out in large HTTP/2 frames.
+# No compression: the messages are a few hundred bytes at most.
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_frame_size', 1024 * 1024),
+    ('grpc.max_send_message_length', 4 * 1024 * 1024),
+]
 
 class PythonClient:
     def __init__(self, address: str = "localhost:50051"):
@@ -12,11 +26,15 @@ class PythonClient:
         self.channel = None
         self.stub = None
         self.stream = None
-        self.pending_requests: Dict[str, asyncio.Future] = {}
+        self.pending_requests: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        # Events sent before connect() wait here until the flusher starts
+        self._event_queue: asyncio.Queue = asyncio.Queue()
+        self._flusher = None
     
     async def connect(self):
         """Connect to the gRPC server"""
-        self.channel = grpc.aio.insecure_channel(self.address)
+        self.channel = grpc.aio.insecure_channel(self.address, options=CHANNEL_OPTIONS)
         self.stub = contract_pb2_grpc.EventServiceStub(self.channel)
         
         # Start bidirectional stream
@@ -26,6 +44,44 @@ class PythonClient:
         
         # Start listening for server messages in background
         asyncio.create_task(self._listen_for_server_messages())
+        
+        self._flusher = asyncio.create_task(self._flush_events())
+    
+    async def _flush_events(self):
+        """Write queued analytic events to the stream in batches"""
+        loop = asyncio.get_running_loop()
+        while True:
+            events = [await self._event_queue.get()]
+            deadline = loop.time() + EVENT_FLUSH_INTERVAL
+            while len(events) < EVENT_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    events.append(await asyncio.wait_for(self._event_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                batch = contract_pb2.AnalyticEventBatch(events=events)
+                await self.stream.write(contract_pb2.ClientMessage(analytic_event_batch=batch))
+                print(f"[Client] Sent batch of {len(events)} analytic events")
+            except Exception as e:
+                # Drop this batch but keep flushing; join() must still see it done
+                print(f"[Client] Error sending batch of {len(events)} analytic events: {e}")
+            finally:
+                for _ in events:
+                    self._event_queue.task_done()
+    
+    async def _wait_for_events(self):
+        """Wait until every queued event has been written, failing if the flusher is not running"""
+        if self._flusher is None or self._flusher.done():
+            raise ConnectionError("Analytic event flusher is not running")
+        joined = asyncio.ensure_future(self._event_queue.join())
+        await asyncio.wait({joined, self._flusher}, return_when=asyncio.FIRST_COMPLETED)
+        if not joined.done():
+            joined.cancel()
+            raise ConnectionError("Analytic event flusher stopped with events still queued")
     
     async def _listen_for_server_messages(self):
         """Listen for messages from the server"""
@@ -60,7 +116,7 @@ class PythonClient:
         print(f"[Client] Would save to database...")
     
     async def send_analytic_event(self, action: str, target: str, metadata: dict = None):
-        """Send an analytic event (no response expected)"""
+        """Queue an analytic event for the next batch write (no response expected)"""
         event = contract_pb2.AnalyticEvent(
             action=action,
             target=target
@@ -69,13 +125,14 @@ class PythonClient:
         if metadata:
             event.metadata.update(metadata)
         
-        message = contract_pb2.ClientMessage(analytic_event=event)
-        await self.stream.write(message)
-        print(f"[Client] Sent analytic event: {action} on {target}")
+        self._event_queue.put_nowait(event)
+        print(f"[Client] Queued analytic event: {action} on {target}")
     
     async def get_recommendations(self, user_id: str, timeout: float = 5.0):
         """Get recommendations (waits for response)"""
-        request_id = str(uuid.uuid4())
+        # Events queued before this request reach the server first
+        await self._wait_for_events()
+        request_id = next(self._request_ids) & 0xFFFFFFFF  # uint32 on the wire
         
         # Create future to wait for response
         future = asyncio.Future()
@@ -101,6 +158,12 @@ class PythonClient:
     
     async def close(self):
         """Close the connection"""
+        if self._flusher:
+            try:
+                await self._wait_for_events()
+            except ConnectionError as e:
+                print(f"[Client] {e}")
+            self._flusher.cancel()
         if self.stream:
             await self.stream.done_writing()
         if self.channel:
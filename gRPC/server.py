@@ -35,6 +35,18 @@ class EventServiceServicer(contract_pb2_grpc.EventServiceServicer):
                 if self.analytics_count % 5 == 0:
                     yield await send_save_state()
             
+            elif client_msg.HasField('analytic_event_batch'):
+                # Handle a batch of analytic events in one go
+                events = client_msg.analytic_event_batch.events
+                previous_count = self.analytics_count
+                self.analytics_count += len(events)
+                print(f"[Server] Analytics batch: {len(events)} events")
+                print(f"[Server] Count: {self.analytics_count}")
+                
+                # Save state whenever the count passes a multiple of 5
+                if self.analytics_count // 5 > previous_count // 5:
+                    yield await send_save_state()
+            
             elif client_msg.HasField('get_recommendations'):
                 # Handle recommendations request
                 req = client_msg.get_recommendations
@@ -52,8 +64,15 @@ class EventServiceServicer(contract_pb2_grpc.EventServiceServicer):
                 self.user_preferences[req.user_id] = "last_recommended"
                 yield await send_save_state()
 
+# Accept the client's 30s keepalive pings instead of answering them with GOAWAY
+SERVER_OPTIONS = [
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.min_recv_ping_interval_without_data_ms', 10000),
+    ('grpc.max_receive_message_length', 4 * 1024 * 1024),
+]
+
 async def serve():
-    server = grpc.aio.server()
+    server = grpc.aio.server(options=SERVER_OPTIONS)
     contract_pb2_grpc.add_EventServiceServicer_to_server(
         EventServiceServicer(), server
     )
@@ -1,19 +1,44 @@
 # client_pipe.py - Windows Named Pipes Client
 import win32file
 import win32pipe
+import win32event
 import pywintypes
+import winerror
 import json
-import struct
 import threading
-import uuid
+import itertools
 import time
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; messages are then encoded with the stdlib json
+    orjson = None
+
+def _dumps(message):
+    if orjson is not None:
+        # Non-string keys (e.g. a None user_id) are stringified as json.dumps does
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+    # Match orjson's output: no whitespace, UTF-8 rather than \u escapes
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Matches the server's pipe buffers; a message that does not fit arrives over
+# several reads flagged ERROR_MORE_DATA
+PIPE_BUFFER_SIZE = 65536
+
 class PipeClient:
     def __init__(self, pipe_name=r'\\.\pipe\PythonServerPipe'):
         self.pipe_name = pipe_name
         self.pipe_handle = None
         self.pending_requests = {}
-        self.running = False
+        self.requests_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._stop_event = None
+        self._write_overlapped = None
+        self._write_lock = threading.Lock()  # one write in flight on _write_overlapped
+        self._listener = None
     
     def connect(self):
         """Connect to the named pipe server"""
@@ -28,7 +53,7 @@ class PipeClient:
                     0,
                     None,
                     win32file.OPEN_EXISTING,
-                    0,
+                    win32file.FILE_FLAG_OVERLAPPED,
                     None
                 )
                 break
@@ -48,45 +73,82 @@ class PipeClient:
         )
         
         print("[Client] Connected!")
-        self.running = True
+        
+        # The handle is overlapped: the listener waits on its read and on
+        # _stop_event together, so close() can interrupt a pending read
+        self._stop_event = win32event.CreateEvent(None, True, False, None)
+        self._write_overlapped = pywintypes.OVERLAPPED()
+        self._write_overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
         
         # Start listening for server messages
-        listener_thread = threading.Thread(target=self._listen, daemon=True)
-        listener_thread.start()
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
     
     def _send_message(self, message):
         """Send a message through the pipe"""
-        data = json.dumps(message).encode('utf-8')
-        length_prefix = struct.pack('I', len(data))
-        win32file.WriteFile(self.pipe_handle, length_prefix + data)
+        # Message mode keeps each write a separate message, so no length prefix is needed
+        data = _dumps(message)
+        with self._write_lock:
+            win32file.WriteFile(self.pipe_handle, data, self._write_overlapped)
+            win32file.GetOverlappedResult(self.pipe_handle, self._write_overlapped, True)
     
-    def _receive_message(self):
+    def _read_chunk(self, overlapped, buf):
+        """Overlapped read into buf; returns (data, more) or None once close() is called"""
+        win32event.ResetEvent(overlapped.hEvent)
+        result, _ = win32file.ReadFile(self.pipe_handle, buf, overlapped)
+        if result == winerror.ERROR_IO_PENDING:
+            signalled = win32event.WaitForMultipleObjects(
+                [overlapped.hEvent, self._stop_event], False, win32event.INFINITE
+            )
+            if signalled == win32event.WAIT_OBJECT_0 + 1:
+                win32file.CancelIo(self.pipe_handle)
+                # The kernel may still touch overlapped and buf until the
+                # cancelled read completes, so wait for that before returning
+                try:
+                    win32file.GetOverlappedResult(self.pipe_handle, overlapped, True)
+                except pywintypes.error as e:
+                    if e.winerror not in (winerror.ERROR_OPERATION_ABORTED, winerror.ERROR_MORE_DATA):
+                        raise
+                return None
+        try:
+            n = win32file.GetOverlappedResult(self.pipe_handle, overlapped, True)
+        except pywintypes.error as e:
+            if e.winerror != winerror.ERROR_MORE_DATA:
+                raise
+            return bytes(buf), True
+        return bytes(buf[:n]), False
+    
+    def _receive_message(self, overlapped, buf):
         """Receive a message from the pipe"""
-        # Read length prefix
-        result, length_data = win32file.ReadFile(self.pipe_handle, 4)
-        if result != 0:
-            return None
-        
-        message_length = struct.unpack('I', length_data)[0]
-        
-        # Read the actual message
-        result, data = win32file.ReadFile(self.pipe_handle, message_length)
-        if result != 0:
+        # Message mode: one read returns the whole message
+        chunk = self._read_chunk(overlapped, buf)
+        if chunk is None:
             return None
-        
-        return json.loads(data.decode('utf-8'))
+        data, more = chunk
+        while more:
+            chunk = self._read_chunk(overlapped, buf)
+            if chunk is None:
+                return None
+            data += chunk[0]
+            more = chunk[1]
+        return _loads(data)
     
     def _listen(self):
         """Listen for messages from server"""
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        buf = win32file.AllocateReadBuffer(PIPE_BUFFER_SIZE)
         try:
-            while self.running:
-                message = self._receive_message()
+            while True:
+                message = self._receive_message(overlapped, buf)
                 if not message:
                     break
                 
                 self._handle_message(message)
         except pywintypes.error as e:
             print(f"[Client] Pipe error: {e}")
+        finally:
+            win32file.CloseHandle(overlapped.hEvent)
     
     def _handle_message(self, message):
         """Handle incoming message from server"""
@@ -97,9 +159,11 @@ class PipeClient:
         
         elif msg_type == 'recommendations_response':
             request_id = message.get('request_id')
-            if request_id in self.pending_requests:
-                self.pending_requests[request_id]['result'] = message.get('data')
-                self.pending_requests[request_id]['event'].set()
+            with self.requests_lock:
+                entry = self.pending_requests.get(request_id)
+            if entry is not None:
+                entry['result'] = message.get('data')
+                entry['event'].set()
     
     def _handle_save_state(self, state_data):
         """Handle save state request from server"""
@@ -121,11 +185,12 @@ class PipeClient:
     
     def get_recommendations(self, user_id, timeout=5.0):
         """Get recommendations (waits for response)"""
-        request_id = str(uuid.uuid4())
+        request_id = next(self._request_ids)
         
         # Create event to wait for response
         event = threading.Event()
-        self.pending_requests[request_id] = {'event': event, 'result': None}
+        with self.requests_lock:
+            self.pending_requests[request_id] = {'event': event, 'result': None}
         
         message = {
             'type': 'get_recommendations',
@@ -136,19 +201,31 @@ class PipeClient:
         print(f"[Client] Sent get_recommendations for {user_id}")
         
         # Wait for response
-        if event.wait(timeout):
-            result = self.pending_requests.pop(request_id)['result']
+        got_response = event.wait(timeout)
+        with self.requests_lock:
+            entry = self.pending_requests.pop(request_id, None)
+        if got_response:
+            result = entry['result']
             print(f"[Client] Got recommendations: {result['recommendations']}")
             return result
         else:
-            self.pending_requests.pop(request_id, None)
             raise TimeoutError(f"Request timed out after {timeout}s")
     
     def close(self):
         """Close the connection"""
-        self.running = False
+        if self._listener:
+            # The listener only returns once its read has completed or been cancelled
+            win32event.SetEvent(self._stop_event)
+            self._listener.join()
+            win32file.CloseHandle(self._stop_event)
         if self.pipe_handle:
-            win32file.CloseHandle(self.pipe_handle)
+            # Taking the write lock waits out any write still in flight
+            with self._write_lock:
+                win32file.CloseHandle(self.pipe_handle)
+                self.pipe_handle = None
+                if self._write_overlapped:
+                    win32file.CloseHandle(self._write_overlapped.hEvent)
+                    self._write_overlapped = None
         print("[Client] Connection closed")
 
 def main():
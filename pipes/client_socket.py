@@ -1,114 +1,150 @@
 # client_socket.py - Fixed shutdown handling
+import asyncio
 import socket
 import json
 import struct
 import threading
-import uuid
+import itertools
 import time
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; messages are then encoded with the stdlib json
+    orjson = None
+
+def _dumps(message):
+    if orjson is not None:
+        # Non-string keys (e.g. a None user_id) are stringified as json.dumps does
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+    # Match orjson's output: no whitespace, UTF-8 rather than \u escapes
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Little-endian uint32 length prefix in front of every message
+_LEN_STRUCT = struct.Struct('<I')
+_LEN_SIZE = _LEN_STRUCT.size
+
+# Socket send/receive buffer size; kernels may clamp it lower
+SOCKET_BUFFER_SIZE = 1 << 20
+
+def _tune_buffers(sock):
+    """Raise the socket's send and receive buffers, keeping the defaults if refused"""
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        except OSError:
+            pass
+
+# With batching on, analytic events are held for up to EVENT_FLUSH_INTERVAL
+# seconds (or until EVENT_BATCH_SIZE are waiting) and sent as one message
+EVENT_BATCH_SIZE = 16
+EVENT_FLUSH_INTERVAL = 0.05
+
+# Clients used through the blocking API share one event loop on one daemon
+# thread, rather than each running its own listener thread
+_shared_loop = None
+_shared_loop_lock = threading.Lock()
+
+def _get_shared_loop():
+    """Start the shared background event loop on first use"""
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = asyncio.new_event_loop()
+            threading.Thread(target=_shared_loop.run_forever, daemon=True).start()
+        return _shared_loop
+
 class SocketClient:
-    def __init__(self, socket_path='/tmp/python_server.sock'):
+    """Unix socket client whose reads and writes all run on one asyncio loop.
+    
+    Async callers use the *_async methods on their own loop; the blocking
+    methods run them on a shared background loop.
+    """
+    def __init__(self, socket_path='/tmp/python_server.sock', batch_events=True):
         self.socket_path = socket_path
-        self.socket = None
+        self.batch_events = batch_events
+        self._pending_events = []
+        self._flush_handle = None
+        self.reader = None
+        self.writer = None
         self.pending_requests = {}
+        self._request_ids = itertools.count(1)
         self.running = False
-        self.listener_started = threading.Event()
-        self.listener_stopped = threading.Event()
-        self.send_lock = threading.Lock()
-        self.listener_thread = None
+        self._loop = None
+        self._listen_task = None
+    
+    def _run(self, coro):
+        """Run a coroutine on the client's loop and block for its result"""
+        if self._loop is None:
+            self._loop = _get_shared_loop()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
     
     def connect(self):
         """Connect to Unix domain socket"""
-        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._run(self.connect_async())
+    
+    async def connect_async(self):
+        """Connect to Unix domain socket and start the listener task"""
+        self._loop = asyncio.get_running_loop()
         
         print(f"[Client] Connecting to {self.socket_path}...")
         max_retries = 10
         for i in range(max_retries):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            _tune_buffers(sock)
+            sock.setblocking(False)
             try:
-                self.socket.connect(self.socket_path)
+                await self._loop.sock_connect(sock, self.socket_path)
                 break
             except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
                 if i < max_retries - 1:
                     print(f"[Client] Waiting for server... ({i+1}/{max_retries})")
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                 else:
                     raise Exception("Could not connect to server")
         
+        self.reader, self.writer = await asyncio.open_unix_connection(sock=sock, limit=65536)
         print("[Client] Connected!")
         self.running = True
-        
-        # Start listener thread
-        self.listener_thread = threading.Thread(target=self._listen, daemon=False)
-        self.listener_thread.start()
-        
-        # Wait for listener to be ready
-        self.listener_started.wait(timeout=2)
-        print("[Client] Listener thread ready")
+        self._listen_task = asyncio.create_task(self._listen())
     
     def _send_message(self, message):
-        """Send a message (thread-safe)"""
-        with self.send_lock:
-            try:
-                if not self.running:
-                    return
-                data = json.dumps(message).encode('utf-8')
-                length_prefix = struct.pack('I', len(data))
-                self.socket.sendall(length_prefix + data)
-            except Exception as e:
-                print(f"[Client] Error sending: {e}")
+        """Write a message to the transport (loop thread only)"""
+        if not self.running:
+            return
+        data = _dumps(message)
+        try:
+            self.writer.writelines((_LEN_STRUCT.pack(len(data)), data))
+        except Exception as e:
+            print(f"[Client] Error sending: {e}")
     
-    def _receive_message(self):
+    async def _receive_message(self):
         """Receive a message"""
         try:
-            # Read exactly 4 bytes for length
-            length_data = self._recv_exact(4)
-            if not length_data:
-                return None
-            
-            message_length = struct.unpack('I', length_data)[0]
+            length_data = await self.reader.readexactly(_LEN_SIZE)
+            message_length = _LEN_STRUCT.unpack(length_data)[0]
             
             # Sanity check for message length
             if message_length > 10 * 1024 * 1024:  # 10MB max
                 print(f"[Client] Invalid message length: {message_length}")
                 return None
             
-            # Read exactly message_length bytes
-            data = self._recv_exact(message_length)
-            if not data:
-                return None
-            
-            return json.loads(data.decode('utf-8'))
-        except socket.error as e:
-            if self.running:
-                print(f"[Client] Socket error receiving: {e}")
+            return _loads(await self.reader.readexactly(message_length))
+        except asyncio.IncompleteReadError:
             return None
         except Exception as e:
             if self.running:
                 print(f"[Client] Error receiving: {e}")
             return None
     
-    def _recv_exact(self, num_bytes):
-        """Receive exactly num_bytes from socket"""
-        data = b''
-        while len(data) < num_bytes:
-            try:
-                chunk = self.socket.recv(num_bytes - len(data))
-                if not chunk:
-                    return None
-                data += chunk
-            except socket.error:
-                if self.running:
-                    raise
-                return None
-        return data
-    
-    def _listen(self):
+    async def _listen(self):
         """Listen for server messages"""
-        self.listener_started.set()
-        
         try:
             while self.running:
-                message = self._receive_message()
+                message = await self._receive_message()
                 if not message:
                     if self.running:
                         print("[Client] Server disconnected")
@@ -124,32 +160,55 @@ class SocketClient:
                 elif msg_type == 'recommendations_response':
                     request_id = message.get('request_id')
                     print(f"[Client] Got recommendations response for request {request_id}")
-                    if request_id in self.pending_requests:
-                        self.pending_requests[request_id]['result'] = message.get('data')
-                        self.pending_requests[request_id]['event'].set()
-        except Exception as e:
-            if self.running:
-                print(f"[Client] Listener error: {e}")
+                    future = self.pending_requests.get(request_id)
+                    if future is not None and not future.done():
+                        future.set_result(message.get('data'))
         finally:
-            self.listener_stopped.set()
-            print("[Client] Listener thread stopped")
+            print("[Client] Listener stopped")
     
     def send_analytic_event(self, action, target):
-        """Send analytic event"""
-        message = {
-            'type': 'analytic_event',
-            'data': {'action': action, 'target': target}
-        }
-        self._send_message(message)
-        print(f"[Client] Sent analytic event: {action} on {target}")
+        """Send analytic event, or queue it for the next batch when batching (thread-safe)"""
+        # Like the other senders, a no-op before connect() and after close()
+        if self._loop is None or not self.running:
+            return
+        self._loop.call_soon_threadsafe(self._queue_event, {'action': action, 'target': target})
+    
+    def _queue_event(self, event):
+        if not self.batch_events:
+            self._send_message({'type': 'analytic_event', 'data': event})
+            print(f"[Client] Sent analytic event: {event['action']} on {event['target']}")
+            return
+        
+        self._pending_events.append(event)
+        if len(self._pending_events) >= EVENT_BATCH_SIZE:
+            self._flush_events()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(EVENT_FLUSH_INTERVAL, self._flush_events)
+        print(f"[Client] Queued analytic event: {event['action']} on {event['target']}")
+    
+    def _flush_events(self):
+        """Send any queued analytic events now (loop thread only)"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        self._send_message({'type': 'analytic_batch', 'data': events})
+        print(f"[Client] Sent batch of {len(events)} analytic events")
     
     def get_recommendations(self, user_id, timeout=5.0):
         """Get recommendations"""
-        request_id = str(uuid.uuid4())
-        event = threading.Event()
+        return self._run(self.get_recommendations_async(user_id, timeout))
+    
+    async def get_recommendations_async(self, user_id, timeout=5.0):
+        """Get recommendations; the listener task resolves the request's future"""
+        # Queued events go first so the server sees them before this request
+        self._flush_events()
         
-        # Set up pending request BEFORE sending
-        self.pending_requests[request_id] = {'event': event, 'result': None}
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self.pending_requests[request_id] = future
         
         message = {
             'type': 'get_recommendations',
@@ -159,37 +218,48 @@ class SocketClient:
         self._send_message(message)
         print(f"[Client] Sent get_recommendations for {user_id}")
         
-        # Wait for response
-        if event.wait(timeout):
-            result = self.pending_requests.pop(request_id)['result']
-            print(f"[Client] Got recommendations: {result['recommendations']}")
-            return result
-        else:
-            self.pending_requests.pop(request_id, None)
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
             raise TimeoutError(f"Request timed out after {timeout}s")
+        finally:
+            self.pending_requests.pop(request_id, None)
+        print(f"[Client] Got recommendations: {result['recommendations']}")
+        return result
     
     def close(self):
         """Close connection gracefully"""
+        if self._loop is not None:
+            self._run(self.close_async())
+    
+    async def close_async(self):
+        """Flush queued events, close the connection and stop the listener"""
         print("[Client] Closing connection...")
-        
-        # Signal listener to stop
+        # Let events already handed over with call_soon_threadsafe reach the
+        # queue, then send them (cancelling the timer) and wait for the write
+        await asyncio.sleep(0)
+        self._flush_events()
+        if self.writer and self.running:
+            try:
+                await self.writer.drain()
+            except Exception as e:
+                print(f"[Client] Error sending: {e}")
         self.running = False
         
-        # Close socket to unblock any recv() calls
-        if self.socket:
+        if self.writer:
             try:
-                self.socket.shutdown(socket.SHUT_RDWR)
-            except:
+                self.writer.close()
+                await self.writer.wait_closed()
+            except Exception:
                 pass
+        
+        if self._listen_task:
+            self._listen_task.cancel()
             try:
-                self.socket.close()
-            except:
+                await self._listen_task
+            except asyncio.CancelledError:
                 pass
         
-        # Wait for listener thread to finish
-        if self.listener_thread and self.listener_thread.is_alive():
-            self.listener_stopped.wait(timeout=2)
-        
         print("[Client] Connection closed")
 
 def main():
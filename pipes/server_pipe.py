@@ -2,15 +2,39 @@
 import win32pipe
 import win32file
 import pywintypes
+import winerror
 import json
-import struct
 import threading
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; messages are then encoded with the stdlib json
+    orjson = None
+
+def _dumps(message):
+    if orjson is not None:
+        # Non-string keys (e.g. a None user_id) are stringified as json.dumps does
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+    # Match orjson's output: no whitespace, UTF-8 rather than \u escapes
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# save_state bodies differ only in the count until user_preferences changes, so
+# the encoded preferences are spliced into this skeleton and reused until then
+_SAVE_STATE_TEMPLATE = b'{"type":"save_state","data":{"analytics_count":%d,"user_preferences":%s}}'
+
+# Pipe in/out buffer size; a larger message arrives over several reads flagged
+# ERROR_MORE_DATA
+PIPE_BUFFER_SIZE = 65536
+
 class PipeServer:
     def __init__(self, pipe_name=r'\\.\pipe\PythonServerPipe'):
         self.pipe_name = pipe_name
         self.analytics_count = 0
         self.user_preferences = {}
+        self._preferences_json = None
         self.pipe_handle = None
         self.running = False
     
@@ -23,8 +47,8 @@ class PipeServer:
             win32pipe.PIPE_ACCESS_DUPLEX,  # Bidirectional
             win32pipe.PIPE_TYPE_MESSAGE | win32pipe.PIPE_READMODE_MESSAGE | win32pipe.PIPE_WAIT,
             1,  # Max instances
-            65536,  # Out buffer size
-            65536,  # In buffer size
+            PIPE_BUFFER_SIZE,  # Out buffer size
+            PIPE_BUFFER_SIZE,  # In buffer size
             0,  # Default timeout
             None  # Security attributes
         )
@@ -39,28 +63,30 @@ class PipeServer:
         self._listen()
     
     def _send_message(self, message):
-        """Send a message through the pipe with length prefix"""
-        data = json.dumps(message).encode('utf-8')
-        # Send length prefix (4 bytes) followed by data
-        length_prefix = struct.pack('I', len(data))
-        win32file.WriteFile(self.pipe_handle, length_prefix + data)
-        print(f"[Server] Sent: {message.get('type')}")
+        """Send a message through the pipe"""
+        try:
+            data = _dumps(message)
+        except Exception as e:
+            print(f"[Server] Error sending message: {e}")
+            return
+        self._send_encoded(data, message.get('type'))
+    
+    def _send_encoded(self, data, msg_type):
+        """Send an already encoded message through the pipe"""
+        # Message mode keeps each write a separate message, so no length prefix is needed
+        win32file.WriteFile(self.pipe_handle, data)
+        print(f"[Server] Sent: {msg_type}")
     
     def _receive_message(self):
         """Receive a message from the pipe"""
-        # Read length prefix (4 bytes)
-        result, length_data = win32file.ReadFile(self.pipe_handle, 4)
+        # Message mode: one read returns the whole message
+        result, data = win32file.ReadFile(self.pipe_handle, PIPE_BUFFER_SIZE)
+        while result == winerror.ERROR_MORE_DATA:
+            result, more = win32file.ReadFile(self.pipe_handle, PIPE_BUFFER_SIZE)
+            data += more
         if result != 0:
             return None
-        
-        message_length = struct.unpack('I', length_data)[0]
-        
-        # Read the actual message
-        result, data = win32file.ReadFile(self.pipe_handle, message_length)
-        if result != 0:
-            return None
-        
-        return json.loads(data.decode('utf-8'))
+        return _loads(data)
     
     def _listen(self):
         """Listen for messages from client"""
@@ -93,7 +119,7 @@ class PipeServer:
         
         elif msg_type == 'get_recommendations':
             user_id = data.get('user_id')
-            request_id = data.get('request_id')
+            request_id = message.get('request_id')
             
             # Send recommendations response
             response = {
@@ -107,19 +133,26 @@ class PipeServer:
             self._send_message(response)
             
             # Update state and save
-            self.user_preferences[user_id] = 'last_recommended'
+            self._set_preference(user_id, 'last_recommended')
             self._send_save_state()
     
+    def _set_preference(self, user_id, value):
+        """Update a user preference, dropping the encoded copy only if it changed"""
+        if self.user_preferences.get(user_id) != value:
+            self.user_preferences[user_id] = value
+            self._preferences_json = None
+    
     def _send_save_state(self):
         """Send save state request to client"""
-        state_message = {
-            'type': 'save_state',
-            'data': {
-                'analytics_count': self.analytics_count,
-                'user_preferences': self.user_preferences
-            }
-        }
-        self._send_message(state_message)
+        if self._preferences_json is None:
+            # An encode failure skips this save and is retried on the next one
+            try:
+                self._preferences_json = _dumps(self.user_preferences)
+            except Exception as e:
+                print(f"[Server] Error sending message: {e}")
+                return
+        data = _SAVE_STATE_TEMPLATE % (self.analytics_count, self._preferences_json)
+        self._send_encoded(data, 'save_state')
     
     def stop(self):
         """Stop the server"""
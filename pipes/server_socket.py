@@ -5,12 +5,58 @@ import struct
 import os
 import threading
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; messages are then encoded with the stdlib json
+    orjson = None
+
+def _dumps(message):
+    if orjson is not None:
+        # Non-string keys (e.g. a None user_id) are stringified as json.dumps does
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+    # Match orjson's output: no whitespace, UTF-8 rather than \u escapes
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# save_state bodies differ only in the count until user_preferences changes, so
+# the encoded preferences are spliced into this skeleton and reused until then
+_SAVE_STATE_TEMPLATE = b'{"type":"save_state","data":{"analytics_count":%d,"user_preferences":%s}}'
+
+# Little-endian uint32 length prefix in front of every message
+_LEN_STRUCT = struct.Struct('<I')
+_LEN_SIZE = _LEN_STRUCT.size
+
+def _send_framed(sock, data):
+    """Write one length-prefixed frame: a single sendmsg, then sendall for whatever it left"""
+    length_prefix = _LEN_STRUCT.pack(len(data))
+    sent = sock.sendmsg([length_prefix, data])
+    if sent < _LEN_SIZE:
+        sock.sendall(length_prefix[sent:])
+        sent = _LEN_SIZE
+    if sent < _LEN_SIZE + len(data):
+        sock.sendall(memoryview(data)[sent - _LEN_SIZE:])
+
+# Socket send/receive buffer size; kernels may clamp it lower
+SOCKET_BUFFER_SIZE = 1 << 20
+
+def _tune_buffers(sock):
+    """Raise the socket's send and receive buffers, keeping the defaults if refused"""
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        except OSError:
+            pass
+
 class SocketServer:
     def __init__(self, socket_path='/tmp/python_server.sock'):
         self.socket_path = socket_path
         self.analytics_count = 0
         self.user_preferences = {}
+        self._preferences_json = None
         self.client_socket = None
+        self._rfile = None
         self.running = False
         self.send_lock = threading.Lock()  # Add lock for thread-safe sending
     
@@ -26,51 +72,55 @@ class SocketServer:
         print(f"[Server] Listening on {self.socket_path}")
         
         self.client_socket, _ = server_socket.accept()
+        _tune_buffers(self.client_socket)
         print("[Server] Client connected!")
+        self._rfile = self.client_socket.makefile('rb', buffering=65536)
         
         self.running = True
         self._listen()
     
     def _send_message(self, message):
         """Send a message with length prefix (thread-safe)"""
+        try:
+            data = _dumps(message)
+        except Exception as e:
+            print(f"[Server] Error sending message: {e}")
+            return
+        self._send_encoded(data, message.get('type'))
+    
+    def _send_encoded(self, data, msg_type):
+        """Send an already encoded message with length prefix (thread-safe)"""
         with self.send_lock:
             try:
-                data = json.dumps(message).encode('utf-8')
-                length_prefix = struct.pack('I', len(data))
-                self.client_socket.sendall(length_prefix + data)
-                print(f"[Server] Sent: {message.get('type')}")
+                _send_framed(self.client_socket, data)
+                print(f"[Server] Sent: {msg_type}")
             except Exception as e:
                 print(f"[Server] Error sending message: {e}")
     
     def _receive_message(self):
         """Receive a message"""
         try:
-            # Read exactly 4 bytes for length
-            length_data = self._recv_exact(4)
+            # Read the length prefix
+            length_data = self._recv_exact(_LEN_SIZE)
             if not length_data:
                 return None
             
-            message_length = struct.unpack('I', length_data)[0]
+            message_length = _LEN_STRUCT.unpack(length_data)[0]
             
             # Read exactly message_length bytes
             data = self._recv_exact(message_length)
             if not data:
                 return None
             
-            return json.loads(data.decode('utf-8'))
+            return _loads(data)
         except Exception as e:
             print(f"[Server] Error receiving message: {e}")
             return None
     
     def _recv_exact(self, num_bytes):
         """Receive exactly num_bytes from socket"""
-        data = b''
-        while len(data) < num_bytes:
-            chunk = self.client_socket.recv(num_bytes - len(data))
-            if not chunk:
-                return None
-            data += chunk
-        return data
+        data = self._rfile.read(num_bytes)
+        return data if len(data) == num_bytes else None
     
     def _listen(self):
         """Listen for client messages"""
@@ -93,9 +143,18 @@ class SocketServer:
                     if self.analytics_count % 5 == 0:
                         self._send_save_state()
                 
+                elif msg_type == 'analytic_batch':
+                    previous_count = self.analytics_count
+                    self.analytics_count += len(data)
+                    print(f"[Server] Analytics batch: {len(data)} events, count: {self.analytics_count}")
+                    
+                    # Save state whenever the batch crossed a multiple of 5
+                    if self.analytics_count // 5 > previous_count // 5:
+                        self._send_save_state()
+                
                 elif msg_type == 'get_recommendations':
                     user_id = data.get('user_id')
-                    request_id = data.get('request_id')
+                    request_id = message.get('request_id')
                     
                     response = {
                         'type': 'recommendations_response',
@@ -107,27 +166,39 @@ class SocketServer:
                     }
                     self._send_message(response)
                     
-                    self.user_preferences[user_id] = 'last_recommended'
+                    self._set_preference(user_id, 'last_recommended')
                     self._send_save_state()
         except Exception as e:
             print(f"[Server] Error: {e}")
         finally:
             self.stop()
     
+    def _set_preference(self, user_id, value):
+        """Update a user preference, dropping the encoded copy only if it changed"""
+        if self.user_preferences.get(user_id) != value:
+            self.user_preferences[user_id] = value
+            self._preferences_json = None
+    
     def _send_save_state(self):
         """Send save state request"""
-        state_message = {
-            'type': 'save_state',
-            'data': {
-                'analytics_count': self.analytics_count,
-                'user_preferences': self.user_preferences
-            }
-        }
-        self._send_message(state_message)
+        if self._preferences_json is None:
+            # An encode failure skips this save and is retried on the next one
+            try:
+                self._preferences_json = _dumps(self.user_preferences)
+            except Exception as e:
+                print(f"[Server] Error sending message: {e}")
+                return
+        data = _SAVE_STATE_TEMPLATE % (self.analytics_count, self._preferences_json)
+        self._send_encoded(data, 'save_state')
     
     def stop(self):
         """Stop the server"""
         self.running = False
+        if self._rfile:
+            try:
+                self._rfile.close()
+            except:
+                pass
         if self.client_socket:
             try:
                 self.client_socket.close()
@@ -3,6 +3,62 @@ from collections import defaultdict, Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Set
 import json
+import math
+import time
+import sys
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; kernels then run as plain Python loops
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def _decayed_story_totals_impl(rows, timestamps, weights, now, half_life_days, n_stories):
+    """Sum time-decayed weights per story row (timestamps in epoch seconds)"""
+    totals = np.zeros(n_stories)
+    rate = math.log(2.0) / (half_life_days * 86400.0)
+    for i in range(rows.shape[0]):
+        totals[rows[i]] += weights[i] * math.exp((timestamps[i] - now) * rate)
+    return totals
+
+
+try:  # Compiled ahead of time by build_kernels.py, so there is no JIT warm-up
+    from rec2_kernels import decayed_story_totals as _decayed_story_totals
+except ImportError:
+    _decayed_story_totals = njit(cache=True)(_decayed_story_totals_impl)
+
+
+# Timestamps are kept as float epoch seconds; datetimes are still accepted at
+# the API boundary and ISO strings are used in saved state
+def _epoch(ts) -> float:
+    return ts.timestamp() if isinstance(ts, datetime) else float(ts)
+
+
+def _to_iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+def _from_iso(text: str) -> float:
+    return datetime.fromisoformat(text).timestamp()
+
+
+# Decay factors are 0.5 ** (age / half_life), computed as exp(-age * rate)
+# with the rate per second worked out once per half-life
+def _decay_rate(half_life_days: float) -> float:
+    return math.log(2.0) / (half_life_days * 86400)
+
+
+# One record per (user, story, interaction kind) feeding the popularity kernel
+INTERACTION_DTYPE = np.dtype([('row', np.int32), ('ts', np.float64), ('weight', np.float64)])
+COMPLETE_WEIGHT = 1.0
+FAVORITE_WEIGHT = 1.5
+
+# A story "works well" for a mood range above this mean decayed improvement
+MOOD_EFFECTIVE_THRESHOLD = 0.5
+
 
 class MoodScore:
     """Represents a simple single-value mood score"""
@@ -26,14 +82,14 @@ class MoodScore:
 class StoryTransition:
     """Represents a transition from one story to another"""
     def __init__(self, from_story_id: str, to_story_id: str, 
-                 user_id: str, timestamp: datetime,
+                 user_id: str, timestamp: float,
                  mood_before: Optional[MoodScore] = None,
                  mood_after: Optional[MoodScore] = None,
                  time_between_minutes: float = 0.0):
         self.from_story_id = from_story_id
         self.to_story_id = to_story_id
         self.user_id = user_id
-        self.timestamp = timestamp
+        self.timestamp = _epoch(timestamp)
         self.mood_before = mood_before  # Mood at start of first story
         self.mood_after = mood_after     # Mood after second story
         self.time_between_minutes = time_between_minutes
@@ -48,7 +104,7 @@ class StoryTransition:
             'from_story_id': self.from_story_id,
             'to_story_id': self.to_story_id,
             'user_id': self.user_id,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': _to_iso(self.timestamp),
             'mood_before': self.mood_before.to_dict() if self.mood_before else None,
             'mood_after': self.mood_after.to_dict() if self.mood_after else None,
             'time_between_minutes': self.time_between_minutes,
@@ -61,7 +117,7 @@ class StoryTransition:
             data['from_story_id'],
             data['to_story_id'],
             data['user_id'],
-            datetime.fromisoformat(data['timestamp']),
+            _from_iso(data['timestamp']),
             MoodScore.from_dict(data['mood_before']) if data['mood_before'] else None,
             MoodScore.from_dict(data['mood_after']) if data['mood_after'] else None,
             data['time_between_minutes']
@@ -73,10 +129,12 @@ class StoryTransition:
 class Story:
     """Represents a story with metadata"""
     def __init__(self, story_id: str, title: str, theme: str, tags: List[str] = None):
-        self.id = story_id
+        # Ids, themes and tags are used as dict keys on every request; interning
+        # lets equal keys share one object and compare by identity
+        self.id = sys.intern(story_id)
         self.title = title
-        self.theme = theme
-        self.tags = tags or []
+        self.theme = sys.intern(theme)
+        self.tags = [sys.intern(tag) for tag in tags or []]
         
         # Individual story effects
         self.mood_associations = []  # List of (mood_before, mood_after, timestamp) tuples
@@ -94,7 +152,7 @@ class Story:
             'theme': self.theme,
             'tags': self.tags,
             'mood_associations': [
-                (mb.to_dict(), ma.to_dict(), ts.isoformat()) 
+                (mb.to_dict(), ma.to_dict(), _to_iso(ts)) 
                 for mb, ma, ts in self.mood_associations
             ],
             'avg_mood_change': self.avg_mood_change,
@@ -107,7 +165,7 @@ class Story:
     def from_dict(cls, data: Dict) -> 'Story':
         story = cls(data['id'], data['title'], data['theme'], data['tags'])
         story.mood_associations = [
-            (MoodScore.from_dict(mb), MoodScore.from_dict(ma), datetime.fromisoformat(ts)) 
+            (MoodScore.from_dict(mb), MoodScore.from_dict(ma), _from_iso(ts)) 
             for mb, ma, ts in data.get('mood_associations', [])
         ]
         story.avg_mood_change = data.get('avg_mood_change')
@@ -119,17 +177,19 @@ class Story:
 
 class AnalyticsEvent:
     """Represents a user interaction event"""
-    def __init__(self, user_id: str, event_type: str, timestamp: datetime, **kwargs):
+    __slots__ = ('user_id', 'event_type', 'timestamp', 'data')
+    
+    def __init__(self, user_id: str, event_type: str, timestamp: float, **kwargs):
         self.user_id = user_id
-        self.event_type = event_type
-        self.timestamp = timestamp
+        self.event_type = sys.intern(event_type)  # a handful of types, compared on every add_event
+        self.timestamp = _epoch(timestamp)
         self.data = kwargs
     
     def to_dict(self) -> Dict:
         return {
             'user_id': self.user_id,
             'event_type': self.event_type,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': _to_iso(self.timestamp),
             'data': self.data
         }
     
@@ -138,7 +198,7 @@ class AnalyticsEvent:
         return cls(
             data['user_id'],
             data['event_type'],
-            datetime.fromisoformat(data['timestamp']),
+            _from_iso(data['timestamp']),
             **data['data']
         )
 
@@ -173,23 +233,23 @@ class UserProfile:
         self.last_completed_story = None
         self.last_completed_timestamp = None
         
-    def get_avoided_themes(self, threshold: float = -1.0, current_time: datetime = None) -> List[str]:
-        current_time = current_time or datetime.now()
+    def get_avoided_themes(self, threshold: float = -1.0, current_time: float = None) -> List[str]:
+        current_time = _epoch(current_time or time.time())
         theme_scores = self._get_decayed_theme_scores(current_time)
         return [theme for theme, score in theme_scores.items() if score < threshold]
     
-    def get_preferred_themes(self, threshold: float = 1.0, current_time: datetime = None) -> List[str]:
-        current_time = current_time or datetime.now()
+    def get_preferred_themes(self, threshold: float = 1.0, current_time: float = None) -> List[str]:
+        current_time = _epoch(current_time or time.time())
         theme_scores = self._get_decayed_theme_scores(current_time)
         return [theme for theme, score in theme_scores.items() if score > threshold]
     
-    def _get_decayed_theme_scores(self, current_time: datetime, half_life_days: float = 30.0) -> Dict[str, float]:
+    def _get_decayed_theme_scores(self, current_time: float, half_life_days: float = 30.0) -> Dict[str, float]:
         theme_scores = defaultdict(float)
+        decay_rate = _decay_rate(half_life_days)
         for theme, interactions in self.theme_interactions.items():
             total_score = 0.0
             for score, timestamp in interactions:
-                days_ago = (current_time - timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / half_life_days)
+                decay_factor = math.exp((timestamp - current_time) * decay_rate)
                 total_score += score * decay_factor
             theme_scores[theme] = total_score
         return theme_scores
@@ -216,6 +276,11 @@ class UserProfile:
         
         self._mood_volatility = np.std(mood_values)
     
+    @property
+    def mood_trend(self) -> Optional[str]:
+        """'improving', 'declining' or 'stable'; recomputed only when a mood is recorded"""
+        return self._mood_trend
+    
     def get_recent_story_path(self, n: int = 3) -> List[str]:
         """Get the last N completed stories as a path"""
         # Sort completed stories by timestamp
@@ -246,13 +311,141 @@ class StoryRecommender:
         self._story_similarity_cache = {}
         self._theme_to_stories = defaultdict(list)
         
+        # mood range -> ids of stories whose effectiveness there is above the threshold
+        self.mood_effective_stories: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Dense story layout: story_id <-> row index, plus per-row theme codes
+        self._story_ids: List[str] = []
+        self._story_index: Dict[str, int] = {}
+        self._themes: List[str] = []
+        self._theme_codes = np.zeros(0, dtype=np.int32)
+        self._theme_rows: Dict[str, np.ndarray] = {}  # theme -> story rows (int32)
+        self._similarity_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._tag_vocab: Dict[str, int] = {}  # tag -> column in the similarity tag matrix
+        
+        # Latest completion/favorite per (user, story row, weight), packed for the kernel
+        self._interactions = np.zeros(64, dtype=INTERACTION_DTYPE)
+        self._n_interactions = 0
+        self._interaction_slots: Dict[Tuple[str, int, float], int] = {}
+        
+        # Bumped on every event or catalog change; keys the cold-start cache
+        self._version = 0
+        self._default_recs: Dict[Tuple[int, Optional[str]], Tuple] = {}
+        self._default_recs_version = -1
+        
+    # Setting a half-life also refreshes the per-second decay rate derived from it
+    @property
+    def event_half_life_days(self) -> float:
+        return self._event_half_life_days
+    
+    @event_half_life_days.setter
+    def event_half_life_days(self, days: float):
+        self._event_half_life_days = days
+        self._event_decay_rate = _decay_rate(days)
+    
+    @property
+    def mood_half_life_days(self) -> float:
+        return self._mood_half_life_days
+    
+    @mood_half_life_days.setter
+    def mood_half_life_days(self, days: float):
+        self._mood_half_life_days = days
+        self._mood_decay_rate = _decay_rate(days)
+    
     def add_story(self, story_id: str, title: str, theme: str, tags: List[str] = None):
+        self._insert_story(story_id, title, theme, tags)
+        self._rebuild_story_arrays()
+    
+    def add_stories_bulk(self, stories):
+        """Add many (story_id, title, theme, tags) records, rebuilding indexes once"""
+        for story_id, title, theme, tags in stories:
+            self._insert_story(story_id, title, theme, list(tags))
+        self._rebuild_story_arrays()
+    
+    def _insert_story(self, story_id: str, title: str, theme: str, tags: List[str] = None):
         story = Story(story_id, title, theme, tags)
-        self.stories[story_id] = story
-        self._theme_to_stories[theme].append(story_id)
-        self._story_similarity_cache = {}
+        self.stories[story.id] = story
+        self._theme_to_stories[story.theme].append(story.id)
+    
+    def _rebuild_story_arrays(self):
+        """Recompute the dense story index and theme codes after the catalog changes"""
+        self._story_ids = list(self.stories)
+        self._story_index = {sid: i for i, sid in enumerate(self._story_ids)}
+        themes = np.array([self.stories[sid].theme for sid in self._story_ids], dtype=object)
+        if len(themes):
+            unique_themes, codes = np.unique(themes, return_inverse=True)
+            self._themes = [str(t) for t in unique_themes]
+            self._theme_codes = codes.astype(np.int32)
+        else:
+            self._themes = []
+            self._theme_codes = np.zeros(0, dtype=np.int32)
+        self._theme_rows = {
+            theme: np.flatnonzero(self._theme_codes == code).astype(np.int32)
+            for code, theme in enumerate(self._themes)
+        }
+        
+        for story in self.stories.values():
+            for tag in story.tags:
+                self._tag_vocab.setdefault(tag, len(self._tag_vocab))
+        # Catalog metadata is static between rebuilds, so every pair is worked
+        # out here: the scorer looks pairs up by (id, id), the app by row
+        similarity = self._build_similarity_matrix()
+        ids = self._story_ids
+        self._story_similarity_cache = {
+            (id1, id2): value
+            for id1, row in zip(ids, similarity.tolist())
+            for id2, value in zip(ids, row)
+        }
+        self._similarity_matrix = similarity.astype(np.float32)
+        self._rebuild_interactions()
+    
+    def _build_similarity_matrix(self) -> np.ndarray:
+        """All-pairs story similarity (theme match plus tag Jaccard) by story row"""
+        n = len(self._story_ids)
+        tags = np.zeros((n, len(self._tag_vocab)), dtype=np.int32)
+        for i, sid in enumerate(self._story_ids):
+            for tag in self.stories[sid].tags:
+                tags[i, self._tag_vocab[tag]] = 1
+        
+        counts = tags.sum(axis=1)
+        intersection = tags @ tags.T
+        union = counts[:, None] + counts[None, :] - intersection
+        both_tagged = (counts[:, None] > 0) & (counts[None, :] > 0)
+        jaccard = np.divide(intersection, union, out=np.zeros((n, n)), where=both_tagged)
+        
+        similarity = 0.5 * (self._theme_codes[:, None] == self._theme_codes[None, :]) + 0.5 * jaccard
+        np.fill_diagonal(similarity, 1.0)
+        return similarity
+    
+    def _rebuild_interactions(self):
+        """Refill the interaction records from user profiles (story rows may have moved)"""
+        self._version += 1
+        self._n_interactions = 0
+        self._interaction_slots = {}
+        for u in self.users.values():
+            for story_id, timestamp in u.completed_stories.items():
+                self._record_interaction(u.user_id, story_id, timestamp, COMPLETE_WEIGHT)
+            for story_id, timestamp in u.favorited_stories.items():
+                self._record_interaction(u.user_id, story_id, timestamp, FAVORITE_WEIGHT)
+    
+    def _record_interaction(self, user_id: str, story_id: str, timestamp: float, weight: float):
+        row = self._story_index.get(story_id)
+        if row is None:
+            return
+        key = (user_id, row, weight)
+        slot = self._interaction_slots.get(key)
+        if slot is None:
+            slot = self._n_interactions
+            if slot == len(self._interactions):
+                grown = np.zeros(2 * slot, dtype=INTERACTION_DTYPE)
+                grown[:slot] = self._interactions
+                self._interactions = grown
+            self._interaction_slots[key] = slot
+            self._n_interactions += 1
+        self._interactions[slot] = (row, timestamp, weight)
         
     def add_event(self, event: AnalyticsEvent):
+        self._version += 1
         self.events.append(event)
         user_id = event.user_id
         
@@ -273,6 +466,7 @@ class StoryRecommender:
         elif event.event_type == 'complete':
             story_id = event.data['story_id']
             user.completed_stories[story_id] = event.timestamp
+            self._record_interaction(user_id, story_id, event.timestamp, COMPLETE_WEIGHT)
             
             if story_id in self.stories:
                 theme = self.stories[story_id].theme
@@ -280,7 +474,7 @@ class StoryRecommender:
             
             # Check for story transition (sequence)
             if user.last_completed_story and user.last_completed_timestamp:
-                time_diff = (event.timestamp - user.last_completed_timestamp).total_seconds() / 60.0
+                time_diff = (event.timestamp - user.last_completed_timestamp) / 60.0
                 
                 # If completed within transition window, record as sequence
                 if time_diff <= self.transition_window_minutes:
@@ -323,6 +517,7 @@ class StoryRecommender:
         elif event.event_type == 'favorite':
             story_id = event.data['story_id']
             user.favorited_stories[story_id] = event.timestamp
+            self._record_interaction(user_id, story_id, event.timestamp, FAVORITE_WEIGHT)
             
             if story_id in self.stories:
                 theme = self.stories[story_id].theme
@@ -344,7 +539,7 @@ class StoryRecommender:
             user.recommendation_mix = max(0.0, min(1.0, position))
     
     def _record_story_transition(self, user: UserProfile, from_story_id: str, 
-                                 to_story_id: str, timestamp: datetime, 
+                                 to_story_id: str, timestamp: float, 
                                  time_between_minutes: float):
         """Record a story-to-story transition"""
         # Get mood information if available
@@ -424,7 +619,7 @@ class StoryRecommender:
             return
         
         from_story = self.stories[from_story_id]
-        current_time = datetime.now()
+        current_time = time.time()
         
         # Collect all transitions from this story
         transitions = self.global_transition_graph[from_story_id]
@@ -439,8 +634,7 @@ class StoryRecommender:
                     continue
                 
                 # Apply time decay
-                days_ago = (current_time - transition.timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+                decay_factor = math.exp((transition.timestamp - current_time) * self._mood_decay_rate)
                 
                 weighted_delta = transition.mood_delta * decay_factor
                 next_story_effects[to_story_id].append(weighted_delta)
@@ -471,14 +665,13 @@ class StoryRecommender:
         if not story.mood_associations:
             return
         
-        current_time = datetime.now()
+        current_time = time.time()
         weighted_improvements = []
         total_weight = 0.0
         
         for before, after, timestamp in story.mood_associations:
             improvement = self._calculate_mood_improvement(before, after)
-            days_ago = (current_time - timestamp).total_seconds() / 86400
-            decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+            decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
             weighted_improvements.append(improvement * decay_factor)
             total_weight += decay_factor
         
@@ -500,21 +693,27 @@ class StoryRecommender:
             'very_high': (9, 10)
         }
         
-        current_time = datetime.now()
+        current_time = time.time()
         range_improvements = defaultdict(list)
         
         for before_mood, after_mood, timestamp in story.mood_associations:
             for range_name, (low, high) in mood_ranges.items():
                 if low <= before_mood.value < high:
                     improvement = self._calculate_mood_improvement(before_mood, after_mood)
-                    days_ago = (current_time - timestamp).total_seconds() / 86400
-                    decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+                    decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
                     range_improvements[range_name].append(improvement * decay_factor)
                     break
         
         for range_name, improvements in range_improvements.items():
             if improvements:
                 story.mood_effectiveness[range_name] = np.mean(improvements)
+                self._update_mood_effective(story, range_name)
+    
+    def _update_mood_effective(self, story: Story, range_name: str):
+        if story.mood_effectiveness.get(range_name, 0) > MOOD_EFFECTIVE_THRESHOLD:
+            self.mood_effective_stories[range_name].add(story.id)
+        else:
+            self.mood_effective_stories[range_name].discard(story.id)
     
     def _get_mood_range(self, mood_value: float) -> str:
         if mood_value < 3:
@@ -531,30 +730,89 @@ class StoryRecommender:
     def get_recommendations(self, user_id: str, context: Dict = None,
                            n_recommendations: int = 10) -> List[Tuple[str, float]]:
         context = context or {}
-        current_time = context.get('current_time', datetime.now())
+        current_time = _epoch(context.get('current_time') or time.time())
         
         if user_id not in self.users:
             self.users[user_id] = UserProfile(user_id)
+            self._version += 1  # popularity is normalized by the user count
         
         user = self.users[user_id]
         
         if 'current_mood' in context:
             user.current_mood = context['current_mood']
         
-        story_scores = {}
-        for story_id, story in self.stories.items():
-            recent_story_ids = [sid for _, sid in user.recent_story_views[-10:]]
-            if story_id in recent_story_ids:
-                continue
-            
-            score = self._score_story_for_user(user, story, context, current_time)
-            story_scores[story_id] = score
+        return self._recommend_for(user, context, current_time, n_recommendations)
+    
+    def get_default_recommendations(self, n_recommendations: int = 10,
+                                    theme: str = None) -> List[Tuple[str, float]]:
+        """Recommendations for a user with no history, cached until events or the catalog change"""
+        if self._default_recs_version != self._version:
+            self._default_recs = {}
+            self._default_recs_version = self._version
+        
+        key = (n_recommendations, theme)
+        if key not in self._default_recs:
+            context = {'theme': theme} if theme else {}
+            self._default_recs[key] = tuple(self._recommend_for(
+                UserProfile('__default__'), context, time.time(), n_recommendations
+            ))
+        return list(self._default_recs[key])
+    
+    def _recommend_for(self, user: UserProfile, context: Dict, current_time: float,
+                       n_recommendations: int) -> List[Tuple[str, float]]:
+        # Everything that does not depend on the candidate story is computed once
+        recent_story_ids = {sid for _, sid in user.recent_story_views[-10:]}
+        signals = self._precompute_signals(user, current_time)
+        
+        # An optional context['theme'] restricts candidates to that theme's rows
+        theme = context.get('theme')
+        rows = self._theme_rows.get(theme, ()) if theme else range(len(self._story_ids))
+        story_ids = self._story_ids
+        candidates = np.array([r for r in rows if story_ids[r] not in recent_story_ids], dtype=np.int32)
+        scores = np.fromiter(
+            (self._score_story_for_user(user, self.stories[story_ids[r]], context, current_time, signals)
+             for r in candidates),
+            dtype=np.float64, count=len(candidates)
+        )
         
-        sorted_stories = sorted(story_scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_stories[:n_recommendations]
+        top = self._top_k(scores, n_recommendations)
+        return [(story_ids[candidates[i]], scores[i]) for i in top]
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores, best first; ties keep catalog order"""
+        if k <= 0:
+            return np.zeros(0, dtype=np.intp)
+        if k < len(scores):
+            # argpartition-style selection instead of a full sort; ties at the
+            # cut-off go to the earliest positions, as a stable sort would
+            kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:k - len(above)]
+            picked = np.concatenate((above, ties))
+        else:
+            picked = np.arange(len(scores))
+        return picked[np.lexsort((picked, -scores[picked]))]
+    
+    def _precompute_signals(self, user: UserProfile, current_time: float) -> Dict:
+        """Per-request inputs shared by every candidate story"""
+        return {
+            'theme_scores': user._get_decayed_theme_scores(current_time, self.event_half_life_days),
+            'avoided_themes': set(user.get_avoided_themes(current_time=current_time)),
+            # A visitor without a stored profile counts as one more user, as it
+            # would once get_recommendations had registered it
+            'popularity': self._popularity_scores(
+                current_time, extra_users=0 if self.users.get(user.user_id) is user else 1
+            ),
+            'collaborative': self._collaborative_filtering_scores(user, current_time),
+            'collaborative_sequence': self._collaborative_sequence_scores(user, current_time)
+        }
     
     def _score_story_for_user(self, user: UserProfile, story: Story, 
-                              context: Dict, current_time: datetime) -> float:
+                              context: Dict, current_time: float,
+                              signals: Dict = None) -> float:
+        if signals is None:
+            signals = self._precompute_signals(user, current_time)
         score = 0.0
         
         mix = user.recommendation_mix
@@ -581,17 +839,15 @@ class StoryRecommender:
         # 3. PERSONAL MOOD HISTORY WITH THIS STORY
         if story.id in user.story_mood_impact:
             mood_change, timestamp = user.story_mood_impact[story.id]
-            days_ago = (current_time - timestamp).total_seconds() / 86400
-            decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+            decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
             normalized_impact = (mood_change + 5) / 10.0
             score += normalized_impact * 2.5 * decay_factor * individual_weight
         
         # 4. THEME PREFERENCES
-        theme_scores = user._get_decayed_theme_scores(current_time, self.event_half_life_days)
-        theme_score = theme_scores.get(story.theme, 0)
+        theme_score = signals['theme_scores'].get(story.theme, 0)
         score += theme_score * 1.5 * individual_weight
         
-        if story.theme in user.get_avoided_themes(current_time=current_time):
+        if story.theme in signals['avoided_themes']:
             score -= 5.0
         
         # 5. CONTENT-BASED
@@ -605,8 +861,7 @@ class StoryRecommender:
                 if fav_id not in self.stories:
                     continue
                 similarity = self._story_similarity(story.id, fav_id)
-                days_ago = (current_time - fav_timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
+                decay_factor = math.exp((fav_timestamp - current_time) * self._event_decay_rate)
                 favorite_scores.append(similarity * decay_factor)
             if favorite_scores:
                 score += max(favorite_scores) * 2.0 * individual_weight
@@ -614,16 +869,16 @@ class StoryRecommender:
         # === COLLABORATIVE SIGNALS ===
         
         # 7. COLLABORATIVE FILTERING
-        collab_score = self._collaborative_filtering_score(user, story, current_time)
+        collab_score = signals['collaborative'][self._story_index[story.id]]
         score += collab_score * 3.0 * collaborative_weight
         
         # 8. COLLABORATIVE SEQUENCE PATTERNS
         # What do other users read after similar stories?
-        collab_sequence_score = self._collaborative_sequence_score(user, story, current_time)
+        collab_sequence_score = signals['collaborative_sequence'].get(story.id, 0.0)
         score += collab_sequence_score * 3.5 * collaborative_weight
         
         # 9. POPULARITY
-        popularity_score = self._popularity_score(user, story, current_time)
+        popularity_score = signals['popularity'][self._story_index[story.id]]
         score += popularity_score * 2.0 * collaborative_weight
         
         # === UNIVERSAL SIGNALS ===
@@ -641,7 +896,7 @@ class StoryRecommender:
         return score
     
     def _sequence_based_score(self, user: UserProfile, candidate_story: Story,
-                             current_time: datetime) -> float:
+                             current_time: float) -> float:
         """
         Score based on how well this story follows the user's last completed story.
         Uses both personal and global transition patterns.
@@ -660,8 +915,7 @@ class StoryRecommender:
             for to_story_id, mood_delta, timestamp in personal_transitions:
                 if to_story_id == candidate_story.id and mood_delta is not None:
                     # Apply time decay
-                    days_ago = (current_time - timestamp).total_seconds() / 86400
-                    decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+                    decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
                     
                     # Positive mood delta = good transition
                     normalized_delta = (mood_delta + 5) / 10.0
@@ -669,8 +923,8 @@ class StoryRecommender:
         
         # 2. GLOBAL STORY-LEVEL PATTERNS
         # What do ALL users experience when following last_story with candidate_story?
-        if candidate_story.id in last_story.best_next_stories:
-            avg_effect = last_story.best_next_stories[candidate_story.id]
+        avg_effect = last_story.best_next_stories.get(candidate_story.id)
+        if avg_effect is not None:
             normalized_effect = (avg_effect + 5) / 10.0
             total_score += normalized_effect * 2.5
         
@@ -685,8 +939,7 @@ class StoryRecommender:
                 
                 weighted_deltas = []
                 for mood_delta, timestamp in theme_deltas:
-                    days_ago = (current_time - timestamp).total_seconds() / 86400
-                    decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+                    decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
                     weighted_deltas.append(mood_delta * decay_factor)
                 
                 if weighted_deltas:
@@ -695,8 +948,8 @@ class StoryRecommender:
                     total_score += normalized_theme * 2.0
         
         # Global theme transitions
-        if candidate_theme in last_story.best_next_themes:
-            avg_theme_effect = last_story.best_next_themes[candidate_theme]
+        avg_theme_effect = last_story.best_next_themes.get(candidate_theme)
+        if avg_theme_effect is not None:
             normalized_effect = (avg_theme_effect + 5) / 10.0
             total_score += normalized_effect * 1.5
         
@@ -712,7 +965,7 @@ class StoryRecommender:
         # 5. RECENCY BOOST
         # If they just completed a story, strongly prefer a good follow-up
         if user.last_completed_timestamp:
-            minutes_since = (current_time - user.last_completed_timestamp).total_seconds() / 60.0
+            minutes_since = (current_time - user.last_completed_timestamp) / 60.0
             if minutes_since < 60:  # Within an hour
                 recency_boost = 1.0 - (minutes_since / 60.0)
                 total_score *= (1.0 + recency_boost * 0.5)  # Up to 50% boost
@@ -720,7 +973,7 @@ class StoryRecommender:
         return total_score
     
     def _evaluate_path_continuation(self, path: List[str], candidate_id: str,
-                                    current_time: datetime) -> float:
+                                    current_time: float) -> float:
         """Evaluate how well candidate continues a multi-story path"""
         if len(path) < 2:
             return 0.0
@@ -740,8 +993,7 @@ class StoryRecommender:
                     for to_id, mood_delta, timestamp in user.preferred_transitions[path[-1]]:
                         if to_id == next_story and mood_delta is not None:
                             # Apply time decay
-                            days_ago = (current_time - timestamp).total_seconds() / 86400
-                            decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+                            decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
                             
                             if to_id == candidate_id:
                                 # This user followed our path and chose our candidate
@@ -755,41 +1007,42 @@ class StoryRecommender:
         return 0.0
     
     def _collaborative_sequence_score(self, user: UserProfile, candidate_story: Story,
-                                      current_time: datetime) -> float:
+                                      current_time: float) -> float:
         """
         What do other similar users read next after stories similar to user's recent reads?
         """
+        return self._collaborative_sequence_scores(user, current_time).get(candidate_story.id, 0.0)
+    
+    def _collaborative_sequence_scores(self, user: UserProfile, current_time: float) -> Dict[str, float]:
+        """_collaborative_sequence_score for every candidate in one pass over the users"""
         if not user.last_completed_story:
-            return 0.0
+            return {}
         
-        # Find users who recently completed the same story
-        similar_user_next_choices = []
+        # Find users who recently completed the same story, and what they read next
+        similar_user_next_choices = defaultdict(list)
         
         for other_user in self.users.values():
             if other_user.user_id == user.user_id:
                 continue
             
-            # Did they complete the same last story?
-            if user.last_completed_story in other_user.preferred_transitions:
-                transitions = other_user.preferred_transitions[user.last_completed_story]
-                
-                for to_id, mood_delta, timestamp in transitions:
-                    if to_id == candidate_story.id and mood_delta is not None:
-                        # Apply time decay
-                        days_ago = (current_time - timestamp).total_seconds() / 86400
-                        decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
-                        
-                        similar_user_next_choices.append(mood_delta * decay_factor)
-        
-        if similar_user_next_choices:
-            avg_effect = np.mean(similar_user_next_choices)
-            normalized_effect = (avg_effect + 5) / 10.0
-            return normalized_effect
+            transitions = other_user.preferred_transitions.get(user.last_completed_story)
+            if not transitions:
+                continue
+            
+            for to_id, mood_delta, timestamp in transitions:
+                if mood_delta is not None:
+                    # Apply time decay
+                    decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
+                    
+                    similar_user_next_choices[to_id].append(mood_delta * decay_factor)
         
-        return 0.0
+        return {
+            to_id: (np.mean(effects) + 5) / 10.0
+            for to_id, effects in similar_user_next_choices.items()
+        }
     
     def _sophisticated_mood_match(self, user: UserProfile, story: Story, 
-                                   current_time: datetime) -> float:
+                                   current_time: float) -> float:
         if not user.current_mood or not story.mood_associations:
             return 0.0
         
@@ -811,8 +1064,7 @@ class StoryRecommender:
             mood_distance = abs(current_mood_value - before_mood.value)
             similarity = 1.0 - (mood_distance / 9.0)
             
-            days_ago = (current_time - timestamp).total_seconds() / 86400
-            decay_factor = 0.5 ** (days_ago / self.mood_half_life_days)
+            decay_factor = math.exp((timestamp - current_time) * self._mood_decay_rate)
             
             improvement = self._calculate_mood_improvement(before_mood, after_mood)
             combined_score = similarity * (1.0 + improvement / 5.0)
@@ -842,19 +1094,25 @@ class StoryRecommender:
         return total_score
     
     def _collaborative_filtering_score(self, user: UserProfile, story: Story, 
-                                       current_time: datetime) -> float:
+                                       current_time: float) -> float:
+        return self._collaborative_filtering_scores(user, current_time)[self._story_index[story.id]]
+    
+    def _collaborative_filtering_scores(self, user: UserProfile, current_time: float) -> np.ndarray:
+        """Best similar-user recency score for every story, indexed by story row"""
+        scores = np.zeros(len(self._story_ids))
         if not user.completed_stories and not user.favorited_stories:
-            return 0.0
+            return scores
         
         user_liked_with_decay = {}
         for story_id, timestamp in {**user.completed_stories, **user.favorited_stories}.items():
-            days_ago = (current_time - timestamp).total_seconds() / 86400
-            decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
+            decay_factor = math.exp((timestamp - current_time) * self._event_decay_rate)
             user_liked_with_decay[story_id] = decay_factor
         
         user_liked = set(user_liked_with_decay.keys())
         
-        similar_users_scores = []
+        # Each other user's similarity is computed once and spread over the
+        # stories they liked, rather than once per candidate story
+        story_index = self._story_index
         for other_user_id, other_user in self.users.items():
             if other_user_id == user.user_id:
                 continue
@@ -862,8 +1120,7 @@ class StoryRecommender:
             other_liked_with_decay = {}
             for story_id, timestamp in {**other_user.completed_stories, 
                                        **other_user.favorited_stories}.items():
-                days_ago = (current_time - timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
+                decay_factor = math.exp((timestamp - current_time) * self._event_decay_rate)
                 other_liked_with_decay[story_id] = decay_factor
             
             other_liked = set(other_liked_with_decay.keys())
@@ -882,37 +1139,33 @@ class StoryRecommender:
             
             similarity = intersection_weight / union_weight if union_weight > 0 else 0
             
-            if story.id in other_liked:
-                recency_weight = other_liked_with_decay.get(story.id, 0)
-                similar_users_scores.append(similarity * recency_weight)
+            for story_id, recency_weight in other_liked_with_decay.items():
+                row = story_index.get(story_id)
+                if row is not None and similarity * recency_weight > scores[row]:
+                    scores[row] = similarity * recency_weight
         
-        if similar_users_scores:
-            return max(similar_users_scores)
-        return 0.0
+        return scores
     
     def _popularity_score(self, user: UserProfile, story: Story, 
-                         current_time: datetime) -> float:
-        completion_score = 0.0
-        favorite_score = 0.0
-        
-        for u in self.users.values():
-            if story.id in u.completed_stories:
-                timestamp = u.completed_stories[story.id]
-                days_ago = (current_time - timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
-                completion_score += decay_factor
-            
-            if story.id in u.favorited_stories:
-                timestamp = u.favorited_stories[story.id]
-                days_ago = (current_time - timestamp).total_seconds() / 86400
-                decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
-                favorite_score += decay_factor * 1.5
-        
-        total_users = max(len(self.users), 1)
-        return (completion_score + favorite_score) / total_users
+                         current_time: float) -> float:
+        return self._popularity_scores(current_time)[self._story_index[story.id]]
+    
+    def _popularity_scores(self, current_time: float, extra_users: int = 0) -> np.ndarray:
+        """Decayed completion/favorite popularity for every story, indexed by story row"""
+        records = self._interactions[:self._n_interactions]
+        totals = _decayed_story_totals(
+            records['row'],
+            records['ts'],
+            records['weight'],
+            current_time,
+            self.event_half_life_days,
+            len(self._story_ids)
+        )
+        total_users = max(len(self.users) + extra_users, 1)
+        return totals / total_users
     
     def _content_based_score(self, user: UserProfile, story: Story, 
-                            current_time: datetime) -> float:
+                            current_time: float) -> float:
         similarities_with_decay = []
         
         for liked_id, timestamp in {**user.completed_stories, **user.favorited_stories}.items():
@@ -920,8 +1173,7 @@ class StoryRecommender:
                 continue
             
             similarity = self._story_similarity(story.id, liked_id)
-            days_ago = (current_time - timestamp).total_seconds() / 86400
-            decay_factor = 0.5 ** (days_ago / self.event_half_life_days)
+            decay_factor = math.exp((timestamp - current_time) * self._event_decay_rate)
             similarities_with_decay.append(similarity * decay_factor)
         
         if similarities_with_decay:
@@ -931,32 +1183,7 @@ class StoryRecommender:
     def _story_similarity(self, story_id1: str, story_id2: str) -> float:
         if story_id1 == story_id2:
             return 1.0
-        
-        cache_key = tuple(sorted([story_id1, story_id2]))
-        if cache_key in self._story_similarity_cache:
-            return self._story_similarity_cache[cache_key]
-        
-        story1 = self.stories.get(story_id1)
-        story2 = self.stories.get(story_id2)
-        
-        if not story1 or not story2:
-            return 0.0
-        
-        similarity = 0.0
-        
-        if story1.theme == story2.theme:
-            similarity += 0.5
-        
-        if story1.tags and story2.tags:
-            tags1 = set(story1.tags)
-            tags2 = set(story2.tags)
-            intersection = len(tags1 & tags2)
-            union = len(tags1 | tags2)
-            if union > 0:
-                similarity += 0.5 * (intersection / union)
-        
-        self._story_similarity_cache[cache_key] = similarity
-        return similarity
+        return self._story_similarity_cache.get((story_id1, story_id2), 0.0)
     
     def get_sequence_insights(self, user_id: str = None) -> Dict:
         """Get insights about story sequences for analysis"""
@@ -1006,26 +1233,26 @@ class StoryRecommender:
             'users': {
                 uid: {
                     'user_id': user.user_id,
-                    'viewed_stories': {sid: ts.isoformat() for sid, ts in user.viewed_stories.items()},
-                    'completed_stories': {sid: ts.isoformat() for sid, ts in user.completed_stories.items()},
-                    'favorited_stories': {sid: ts.isoformat() for sid, ts in user.favorited_stories.items()},
+                    'viewed_stories': {sid: _to_iso(ts) for sid, ts in user.viewed_stories.items()},
+                    'completed_stories': {sid: _to_iso(ts) for sid, ts in user.completed_stories.items()},
+                    'favorited_stories': {sid: _to_iso(ts) for sid, ts in user.favorited_stories.items()},
                     'theme_interactions': {
-                        theme: [(score, ts.isoformat()) for score, ts in interactions]
+                        theme: [(score, _to_iso(ts)) for score, ts in interactions]
                         for theme, interactions in user.theme_interactions.items()
                     },
-                    'mood_history': [(ts.isoformat(), mood.to_dict()) for ts, mood in user.mood_history],
+                    'mood_history': [(_to_iso(ts), mood.to_dict()) for ts, mood in user.mood_history],
                     'current_mood': user.current_mood.to_dict() if user.current_mood else None,
                     'story_mood_impact': {
-                        sid: (change, ts.isoformat()) 
+                        sid: (change, _to_iso(ts)) 
                         for sid, (change, ts) in user.story_mood_impact.items()
                     },
-                    'recent_story_views': [(ts.isoformat(), sid) for ts, sid in user.recent_story_views],
+                    'recent_story_views': [(_to_iso(ts), sid) for ts, sid in user.recent_story_views],
                     'recommendation_mix': user.recommendation_mix,
                     'mood_trend': user._mood_trend,
                     'mood_volatility': user._mood_volatility,
                     'story_sequences': [t.to_dict() for t in user.story_sequences],
                     'last_completed_story': user.last_completed_story,
-                    'last_completed_timestamp': user.last_completed_timestamp.isoformat() if user.last_completed_timestamp else None
+                    'last_completed_timestamp': _to_iso(user.last_completed_timestamp) if user.last_completed_timestamp else None
                 }
                 for uid, user in self.users.items()
             },
@@ -1052,8 +1279,12 @@ class StoryRecommender:
         }
         
         self._theme_to_stories = defaultdict(list)
+        self.mood_effective_stories = defaultdict(set)
         for sid, story in self.stories.items():
             self._theme_to_stories[story.theme].append(sid)
+            for range_name in story.mood_effectiveness:
+                self._update_mood_effective(story, range_name)
+        self._rebuild_story_arrays()
         
         # Load story transitions (global)
         self.story_transitions = [
@@ -1071,35 +1302,35 @@ class StoryRecommender:
         for uid, user_data in state.get('users', {}).items():
             user = UserProfile(uid)
             user.viewed_stories = {
-                sid: datetime.fromisoformat(ts) 
+                sid: _from_iso(ts) 
                 for sid, ts in user_data['viewed_stories'].items()
             }
             user.completed_stories = {
-                sid: datetime.fromisoformat(ts) 
+                sid: _from_iso(ts) 
                 for sid, ts in user_data['completed_stories'].items()
             }
             user.favorited_stories = {
-                sid: datetime.fromisoformat(ts) 
+                sid: _from_iso(ts) 
                 for sid, ts in user_data['favorited_stories'].items()
             }
             user.theme_interactions = defaultdict(list)
             for theme, interactions in user_data['theme_interactions'].items():
                 user.theme_interactions[theme] = [
-                    (score, datetime.fromisoformat(ts)) 
+                    (score, _from_iso(ts)) 
                     for score, ts in interactions
                 ]
             user.mood_history = [
-                (datetime.fromisoformat(ts), MoodScore.from_dict(mood))
+                (_from_iso(ts), MoodScore.from_dict(mood))
                 for ts, mood in user_data['mood_history']
             ]
             if user_data['current_mood']:
                 user.current_mood = MoodScore.from_dict(user_data['current_mood'])
             user.story_mood_impact = {
-                sid: (change, datetime.fromisoformat(ts))
+                sid: (change, _from_iso(ts))
                 for sid, (change, ts) in user_data['story_mood_impact'].items()
             }
             user.recent_story_views = [
-                (datetime.fromisoformat(ts), sid)
+                (_from_iso(ts), sid)
                 for ts, sid in user_data['recent_story_views']
             ]
             user.recommendation_mix = user_data.get('recommendation_mix', 0.5)
@@ -1130,9 +1361,10 @@ class StoryRecommender:
             
             user.last_completed_story = user_data.get('last_completed_story')
             if user_data.get('last_completed_timestamp'):
-                user.last_completed_timestamp = datetime.fromisoformat(user_data['last_completed_timestamp'])
+                user.last_completed_timestamp = _from_iso(user_data['last_completed_timestamp'])
             
             self.users[uid] = user
+        self._rebuild_interactions()
         
         # Load events
         self.events = [
@@ -1247,6 +1479,13 @@ if __name__ == "__main__":
             print(f"   ✓ {story.theme} theme works well after mystery (avg: {theme_effect:+.2f})")
         print()
     
+    # The shared cold-start list must match what a brand-new user is given
+    default_recs = recommender.get_default_recommendations(5)
+    fresh_recs = recommender.get_recommendations("new_visitor", n_recommendations=5)
+    assert [sid for sid, _ in default_recs] == [sid for sid, _ in fresh_recs]
+    assert np.allclose([sc for _, sc in default_recs], [sc for _, sc in fresh_recs])
+    print("Cold-start recommendations match a fresh user's\n")
+    
     # Show sequence insights
     print("\n" + "=" * 80)
     print("SEQUENCE INSIGHTS")
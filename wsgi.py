@@ -0,0 +1,17 @@
+# wsgi.py - gevent entry point for serving the Story Recommender Demo
+# Monkey-patching has to happen before Flask (and anything using sockets,
+# threads or time) is imported, so the app is only imported afterwards.
+from gevent import monkey
+monkey.patch_all()
+
+import os
+
+from app import app
+
+if __name__ == '__main__':
+    # Standalone gevent server (no gunicorn); python app.py keeps the debug reloader
+    from gevent.pywsgi import WSGIServer
+    host = os.environ.get('HOST', '127.0.0.1')
+    port = int(os.environ.get('PORT', '5000'))
+    print(f"Serving on http://{host}:{port}")
+    WSGIServer((host, port), app).serve_forever()